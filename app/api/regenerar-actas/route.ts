@@ -0,0 +1,626 @@
+import { NextRequest, NextResponse } from "next/server";
+
+import {
+  actaCitaProximaAudiencia,
+  actaRequiereExcel,
+  buildActaFileName,
+  buildDocx,
+  createActaRenderCache,
+  loadEventoUsuario,
+  normalizeHoraHHMM,
+  saveActaAudienciaSnapshot,
+  toErrorMessage,
+  type AcreenciaRow,
+  type ActaRenderCache,
+  type Asistente,
+  type ProcesoExcelArchivoRow,
+  type TerminarAudienciaPayload,
+} from "@/lib/acta-audiencia";
+import { uploadDocxToGoogleDrive, uploadFileToGoogleDrive } from "@/lib/google-drive";
+import { createAdminSupabase } from "@/lib/supabase-admin";
+import { createZipWriter } from "@/lib/zip";
+
+export const runtime = "nodejs";
+// Vercel cuts the response at maxDuration, which would leave a ZIP without its
+// central directory, so new renders stop at BATCH_TIME_BUDGET_MS and the rest
+// are reported as pending for the client to request in a follow-up call.
+export const maxDuration = 300;
+
+const BATCH_TIME_BUDGET_MS = 240_000;
+const DEFAULT_CONCURRENCY = 4;
+const MAX_CONCURRENCY = 8;
+const MAX_ACTAS = 200;
+// Snapshot rows matched by a filter before keeping the latest per audiencia.
+const MAX_SNAPSHOT_ROWS = 2000;
+// PostgREST caps each response at 1000 rows by default.
+const SNAPSHOT_PAGE_SIZE = 1000;
+// Keeps `in.(...)` filters well below URL length limits.
+const ID_CHUNK_SIZE = 100;
+
+type AdminSupabase = ReturnType<typeof createAdminSupabase>;
+
+type RegenerarActasPayload = {
+  actaIds?: string[];
+  filtro?: {
+    desde?: string; // YYYY-MM-DD
+    hasta?: string; // YYYY-MM-DD
+    usuarioId?: string;
+    estado?: string;
+    tipoDocumento?: string;
+  };
+  destino?: "zip" | "drive";
+  // zip only: stream NDJSON progress and upload the finished ZIP instead of streaming it.
+  progreso?: boolean;
+  concurrencia?: number;
+  debug?: boolean;
+};
+
+type ActaSnapshotRow = {
+  id: string;
+  proceso_id: string;
+  evento_id: string | null;
+  tipo_documento: string | null;
+  titulo: string | null;
+  ciudad: string | null;
+  fecha: string;
+  hora: string | null;
+  resumen: TerminarAudienciaPayload["resumen"] | null;
+  asistentes: Asistente[] | null;
+  acreencias: AcreenciaRow[] | null;
+  propuesta_pago: TerminarAudienciaPayload["propuestaPago"] | null;
+};
+
+type ProcesoEvento = { id: string; fecha: string; hora: string | null; tipo: string | null };
+
+type ActaBatchResult =
+  | {
+      actaId: string;
+      procesoId: string;
+      fecha: string;
+      ok: true;
+      fileName: string;
+      fileId?: string;
+      webViewLink?: string | null;
+      nuevaActaId?: string | null;
+    }
+  | { actaId: string; procesoId: string; fecha: string; ok: false; error: string };
+
+const ACTA_SNAPSHOT_COLUMNS =
+  "id, proceso_id, evento_id, tipo_documento, titulo, ciudad, fecha, hora, resumen, asistentes, acreencias, propuesta_pago";
+
+const FILTRO_FIELDS = ["desde", "hasta", "usuarioId", "estado", "tipoDocumento"] as const;
+
+function isDateKey(value: string | undefined) {
+  return value === undefined || /^\d{4}-\d{2}-\d{2}$/.test(value);
+}
+
+function isPlainObject(value: unknown): value is Record<string, unknown> {
+  return Boolean(value) && typeof value === "object" && !Array.isArray(value);
+}
+
+function parseRegenerarActasPayload(
+  body: unknown
+): { payload: RegenerarActasPayload } | { error: string } {
+  if (!isPlainObject(body)) return { error: "Body must be a JSON object." };
+
+  const destino = body.destino ?? "zip";
+  if (destino !== "zip" && destino !== "drive") {
+    return { error: "destino must be 'zip' or 'drive'." };
+  }
+
+  let actaIds: string[] | undefined;
+  if (body.actaIds !== undefined) {
+    if (
+      !Array.isArray(body.actaIds) ||
+      !body.actaIds.every((id) => typeof id === "string" && id.trim() !== "")
+    ) {
+      return { error: "actaIds must be an array of non-empty strings." };
+    }
+    actaIds = [...new Set((body.actaIds as string[]).map((id) => id.trim()))];
+    if (actaIds.length > MAX_ACTAS) {
+      return { error: `Too many actaIds (${actaIds.length}). Send at most ${MAX_ACTAS}.` };
+    }
+  }
+
+  let filtro: RegenerarActasPayload["filtro"];
+  if (body.filtro !== undefined) {
+    if (!isPlainObject(body.filtro)) return { error: "filtro must be an object." };
+    filtro = {};
+    for (const field of FILTRO_FIELDS) {
+      const value = body.filtro[field];
+      if (value === undefined || value === null) continue;
+      if (typeof value !== "string" || !value.trim()) {
+        return { error: `filtro.${field} must be a non-empty string.` };
+      }
+      filtro[field] = value.trim();
+    }
+    if (!isDateKey(filtro.desde) || !isDateKey(filtro.hasta)) {
+      return { error: "filtro.desde/hasta must be YYYY-MM-DD." };
+    }
+  }
+
+  if (!actaIds?.length && !(filtro && Object.keys(filtro).length > 0)) {
+    return { error: "Provide actaIds or at least one filtro field." };
+  }
+
+  if (body.concurrencia !== undefined && typeof body.concurrencia !== "number") {
+    return { error: "concurrencia must be a number." };
+  }
+  if (body.debug !== undefined && typeof body.debug !== "boolean") {
+    return { error: "debug must be a boolean." };
+  }
+  if (body.progreso !== undefined && typeof body.progreso !== "boolean") {
+    return { error: "progreso must be a boolean." };
+  }
+
+  return {
+    payload: {
+      actaIds,
+      filtro,
+      destino,
+      progreso: body.progreso as boolean | undefined,
+      concurrencia: body.concurrencia as number | undefined,
+      debug: body.debug as boolean | undefined,
+    },
+  };
+}
+
+async function resolveAdminCaller(request: NextRequest, supabaseAdmin: AdminSupabase) {
+  const authorization = request.headers.get("authorization");
+  const accessToken = authorization?.startsWith("Bearer ") ? authorization.slice(7) : null;
+  if (!accessToken) return { status: 401 as const };
+
+  const {
+    data: { user: callerUser },
+    error: userError,
+  } = await supabaseAdmin.auth.getUser(accessToken);
+  if (userError || !callerUser) return { status: 401 as const };
+
+  const { data: callerProfile } = await supabaseAdmin
+    .from("usuarios")
+    .select("rol")
+    .eq("auth_id", callerUser.id)
+    .maybeSingle();
+
+  const isAdmin = (callerProfile?.rol ?? "").trim().toLowerCase() === "admin";
+  if (!isAdmin) return { status: 403 as const };
+
+  return { status: 200 as const, authUserId: callerUser.id };
+}
+
+function chunk<T>(items: T[], size: number) {
+  const chunks: T[][] = [];
+  for (let i = 0; i < items.length; i += size) {
+    chunks.push(items.slice(i, i + size));
+  }
+  return chunks;
+}
+
+async function loadActaSnapshots(
+  supabaseAdmin: AdminSupabase,
+  payload: RegenerarActasPayload
+): Promise<{ actas: ActaSnapshotRow[]; matched: number }> {
+  // actas_audiencia is not part of the generated Database types yet.
+  const actasTable = (columns: string, options?: { count: "exact"; head: true }) =>
+    (supabaseAdmin as any).from("actas_audiencia").select(columns, options);
+
+  if (payload.actaIds && payload.actaIds.length > 0) {
+    const actas: ActaSnapshotRow[] = [];
+    for (const ids of chunk(payload.actaIds, ID_CHUNK_SIZE)) {
+      const { data, error } = await actasTable(ACTA_SNAPSHOT_COLUMNS).in("id", ids);
+      if (error) throw new Error(`Unable to load actas: ${error.message}`);
+      actas.push(...((data ?? []) as ActaSnapshotRow[]));
+    }
+    return { actas, matched: actas.length };
+  }
+
+  const filtro = payload.filtro ?? {};
+  // Filter on proceso columns through an inner embed rather than an id list in the URL.
+  const procesoJoin = filtro.usuarioId || filtro.estado ? ", proceso!inner(usuario_id, estado)" : "";
+  const applyFiltro = (query: any) => {
+    if (filtro.usuarioId) query = query.eq("proceso.usuario_id", filtro.usuarioId);
+    if (filtro.estado) query = query.eq("proceso.estado", filtro.estado);
+    if (filtro.desde) query = query.gte("fecha", filtro.desde);
+    if (filtro.hasta) query = query.lte("fecha", filtro.hasta);
+    if (filtro.tipoDocumento) query = query.eq("tipo_documento", filtro.tipoDocumento);
+    return query;
+  };
+
+  const { count, error: countError } = await applyFiltro(
+    actasTable(`id${procesoJoin}`, { count: "exact", head: true })
+  );
+  if (countError) throw new Error(`Unable to count actas: ${countError.message}`);
+  const matched = count ?? 0;
+  if (matched > MAX_SNAPSHOT_ROWS) return { actas: [], matched };
+
+  const rows: ActaSnapshotRow[] = [];
+  for (let from = 0; from < matched; from += SNAPSHOT_PAGE_SIZE) {
+    const { data, error } = await applyFiltro(actasTable(`${ACTA_SNAPSHOT_COLUMNS}${procesoJoin}`))
+      .order("created_at", { ascending: false })
+      .order("id", { ascending: true })
+      .range(from, from + SNAPSHOT_PAGE_SIZE - 1);
+    if (error) throw new Error(`Unable to load actas: ${error.message}`);
+    rows.push(...((data ?? []) as ActaSnapshotRow[]));
+  }
+
+  // An audiencia may have been terminated more than once; only the latest snapshot counts.
+  const seen = new Set<string>();
+  const actas = rows.filter((acta) => {
+    const key = `${acta.proceso_id}|${acta.evento_id ?? acta.fecha}|${acta.tipo_documento ?? ""}`;
+    if (seen.has(key)) return false;
+    seen.add(key);
+    return true;
+  });
+  return { actas, matched };
+}
+
+async function loadProcesoContext(supabaseAdmin: AdminSupabase, procesoIds: string[]) {
+  const numeroProcesoById = new Map<string, string>();
+  const deudorByProcesoId = new Map<string, NonNullable<TerminarAudienciaPayload["deudor"]>>();
+  const eventosByProcesoId = new Map<string, ProcesoEvento[]>();
+  const excelArchivoByProcesoId = new Map<string, ProcesoExcelArchivoRow>();
+
+  for (const ids of chunk(procesoIds, ID_CHUNK_SIZE)) {
+    const { data: procesos, error } = await supabaseAdmin
+      .from("proceso")
+      .select(
+        "id, numero_proceso, deudores(nombre, identificacion, tipo_identificacion, created_at), eventos(id, fecha, hora, tipo), proceso_excel_archivos(id, proceso_id, original_file_name, drive_file_id, drive_file_name, drive_web_view_link, drive_web_content_link, created_at)"
+      )
+      .in("id", ids);
+
+    if (error) throw new Error(`Unable to load procesos: ${error.message}`);
+
+    for (const proceso of procesos ?? []) {
+      numeroProcesoById.set(proceso.id, proceso.numero_proceso);
+      eventosByProcesoId.set(proceso.id, proceso.eventos ?? []);
+
+      const deudor = [...(proceso.deudores ?? [])].sort((a, b) =>
+        a.created_at.localeCompare(b.created_at)
+      )[0];
+      if (deudor) {
+        deudorByProcesoId.set(proceso.id, {
+          nombre: deudor.nombre,
+          identificacion: deudor.identificacion,
+          tipoIdentificacion: deudor.tipo_identificacion ?? undefined,
+        });
+      }
+
+      // Same row /lista sends as excelArchivo: the latest upload for the proceso.
+      const excelArchivo = [...(proceso.proceso_excel_archivos ?? [])].sort((a, b) =>
+        b.created_at.localeCompare(a.created_at)
+      )[0];
+      if (excelArchivo) excelArchivoByProcesoId.set(proceso.id, excelArchivo);
+    }
+  }
+
+  return { numeroProcesoById, deudorByProcesoId, eventosByProcesoId, excelArchivoByProcesoId };
+}
+
+// The next hearing is the proceso's first evento after the acta's own audiencia,
+// preferring tipo "audiencia" like the eventoSiguienteId picked on /lista.
+function resolveProximaAudiencia(
+  acta: ActaSnapshotRow,
+  eventos: ProcesoEvento[]
+): TerminarAudienciaPayload["proximaAudiencia"] | null {
+  const actaEvento = acta.evento_id ? eventos.find((e) => e.id === acta.evento_id) : undefined;
+  const anchorFecha = actaEvento?.fecha ?? acta.fecha;
+  const anchorHora = normalizeHoraHHMM(actaEvento?.hora ?? acta.hora);
+
+  const siguientes = eventos
+    .map((e) => ({ ...e, horaHHMM: normalizeHoraHHMM(e.hora) }))
+    .filter((e) => {
+      if (e.id === acta.evento_id) return false;
+      if (e.fecha > anchorFecha) return true;
+      return e.fecha === anchorFecha && Boolean(anchorHora && e.horaHHMM && e.horaHHMM > anchorHora);
+    })
+    .sort((a, b) => a.fecha.localeCompare(b.fecha) || (a.horaHHMM ?? "").localeCompare(b.horaHHMM ?? ""));
+
+  const pick =
+    siguientes.find((e) => (e.tipo ?? "").toLowerCase() === "audiencia") ?? siguientes[0] ?? null;
+  return pick ? { fecha: pick.fecha, hora: pick.horaHHMM ?? undefined } : null;
+}
+
+function snapshotToPayload(
+  acta: ActaSnapshotRow,
+  context: Awaited<ReturnType<typeof loadProcesoContext>>,
+  authUserId: string,
+  debug: boolean
+): TerminarAudienciaPayload {
+  // A regenerated acta must never fall back to placeholders; fail it instead.
+  const numeroProceso = context.numeroProcesoById.get(acta.proceso_id);
+  if (!numeroProceso) {
+    throw new Error("Proceso not found; it may have been deleted.");
+  }
+  const deudor = context.deudorByProcesoId.get(acta.proceso_id);
+  if (!deudor) {
+    throw new Error("Proceso has no deudor registered.");
+  }
+  const excelArchivo = context.excelArchivoByProcesoId.get(acta.proceso_id);
+  if (!excelArchivo && actaRequiereExcel(acta.tipo_documento)) {
+    throw new Error("Proceso has no Excel file for the payment projection of an acuerdo de pago.");
+  }
+
+  const proximaAudiencia = resolveProximaAudiencia(
+    acta,
+    context.eventosByProcesoId.get(acta.proceso_id) ?? []
+  );
+  if (!proximaAudiencia && actaCitaProximaAudiencia(acta.tipo_documento)) {
+    throw new Error("No evento found after this audiencia to cite as the next hearing.");
+  }
+
+  const asistentes = Array.isArray(acta.asistentes) ? acta.asistentes : [];
+  const presentes = asistentes.filter((a) => a.estado === "Presente").length;
+
+  // The operador is resolved by buildDocx from the evento owner, the same fallback
+  // used by /api/terminar-audiencia.
+  return {
+    procesoId: acta.proceso_id,
+    authUserId,
+    numeroProceso,
+    titulo: acta.titulo ?? "",
+    fecha: acta.fecha,
+    eventoId: acta.evento_id,
+    hora: acta.hora ?? undefined,
+    ciudad: acta.ciudad ?? undefined,
+    tipoDocumento: acta.tipo_documento ?? undefined,
+    debug,
+    resumen: acta.resumen ?? {
+      total: asistentes.length,
+      presentes,
+      ausentes: asistentes.length - presentes,
+    },
+    asistentes,
+    acreencias: Array.isArray(acta.acreencias) ? acta.acreencias : [],
+    deudor,
+    excelArchivo,
+    propuestaPago: acta.propuesta_pago ?? undefined,
+    proximaAudiencia: proximaAudiencia ?? undefined,
+  };
+}
+
+async function runWithConcurrency<T>(
+  items: T[],
+  limit: number,
+  worker: (item: T, index: number) => Promise<void>
+) {
+  let nextIndex = 0;
+  const runners = Array.from({ length: Math.min(limit, items.length) }, async () => {
+    while (nextIndex < items.length) {
+      const index = nextIndex;
+      nextIndex += 1;
+      await worker(items[index], index);
+    }
+  });
+  await Promise.all(runners);
+}
+
+function uniqueZipEntryName(fileName: string, used: Set<string>) {
+  const base = fileName.replace(/[\\/]+/g, "-");
+  let candidate = base;
+  for (let n = 2; used.has(candidate); n += 1) {
+    candidate = base.replace(/\.docx$/i, "") + ` (${n}).docx`;
+  }
+  used.add(candidate);
+  return candidate;
+}
+
+async function renderActa(payload: TerminarAudienciaPayload, cache: ActaRenderCache) {
+  const eventoContext = await loadEventoUsuario({
+    eventoId: payload.eventoId ?? null,
+    procesoId: payload.procesoId,
+    fecha: payload.fecha,
+    hora: payload.hora ?? null,
+  });
+  const buffer = await buildDocx(payload, eventoContext, cache, { strictExcel: true });
+  return { buffer, eventoContext, fileName: buildActaFileName(payload) };
+}
+
+export async function POST(request: NextRequest) {
+  const startedAt = Date.now();
+  let supabaseAdmin: AdminSupabase;
+  try {
+    supabaseAdmin = createAdminSupabase();
+  } catch (e: unknown) {
+    return NextResponse.json(
+      { error: "Server configuration incomplete.", detail: toErrorMessage(e) },
+      { status: 500 }
+    );
+  }
+
+  const caller = await resolveAdminCaller(request, supabaseAdmin);
+  if (caller.status === 401) {
+    return NextResponse.json({ error: "Unauthorized." }, { status: 401 });
+  }
+  if (caller.status === 403) {
+    return NextResponse.json({ error: "Admin role required." }, { status: 403 });
+  }
+
+  let body: unknown;
+  try {
+    body = await request.json();
+  } catch {
+    return NextResponse.json({ error: "Invalid JSON body." }, { status: 400 });
+  }
+
+  const parsed = parseRegenerarActasPayload(body);
+  if ("error" in parsed) {
+    return NextResponse.json({ error: parsed.error }, { status: 400 });
+  }
+  const payload = parsed.payload;
+  const destino = payload.destino ?? "zip";
+
+  let actas: ActaSnapshotRow[];
+  let context: Awaited<ReturnType<typeof loadProcesoContext>>;
+  try {
+    const loaded = await loadActaSnapshots(supabaseAdmin, payload);
+    if (loaded.matched > MAX_SNAPSHOT_ROWS) {
+      return NextResponse.json(
+        {
+          error: `The filter matches ${loaded.matched} acta snapshots (max ${MAX_SNAPSHOT_ROWS}). Narrow the filter.`,
+        },
+        { status: 400 }
+      );
+    }
+    actas = loaded.actas;
+    if (actas.length === 0) {
+      return NextResponse.json({ error: "No actas match the request." }, { status: 404 });
+    }
+    if (actas.length > MAX_ACTAS) {
+      return NextResponse.json(
+        { error: `Too many actas (${actas.length}). Narrow the filter to at most ${MAX_ACTAS}.` },
+        { status: 400 }
+      );
+    }
+    context = await loadProcesoContext(
+      supabaseAdmin,
+      [...new Set(actas.map((acta) => acta.proceso_id))]
+    );
+  } catch (e: unknown) {
+    return NextResponse.json(
+      { error: "Failed to load actas.", detail: toErrorMessage(e) },
+      { status: 500 }
+    );
+  }
+
+  const concurrency = Math.min(
+    MAX_CONCURRENCY,
+    Math.max(1, Math.floor(Number(payload.concurrencia) || DEFAULT_CONCURRENCY))
+  );
+  const debug = payload.debug === true;
+  const cache = createActaRenderCache();
+  const total = actas.length;
+
+  const { readable, writable } = new TransformStream<Uint8Array, Uint8Array>();
+  const writer = writable.getWriter();
+  const write = (chunk: Uint8Array) => {
+    // A rejected write means the client went away; request.signal stops the pool.
+    writer.write(chunk).catch(() => undefined);
+  };
+  const writeEvent = (event: Record<string, unknown>) => {
+    write(Buffer.from(`${JSON.stringify(event)}\n`, "utf8"));
+  };
+
+  // Drive uploads always report progress. A ZIP is either streamed as the response body
+  // (no room for progress events) or, with progreso, buffered and uploaded at the end
+  // while the response carries the progress events.
+  const progreso = destino === "drive" || payload.progreso === true;
+  const zipChunks: Uint8Array[] = [];
+  const zip =
+    destino === "zip"
+      ? createZipWriter(progreso ? (chunk) => zipChunks.push(chunk) : write)
+      : null;
+  const stamp = new Date().toISOString().slice(0, 19).replace(/[:T]/g, "-");
+  const usedZipNames = new Set<string>();
+  const results: ActaBatchResult[] = [];
+  const pending: string[] = [];
+
+  const processActa = async (acta: ActaSnapshotRow) => {
+    if (request.signal.aborted) return;
+    if (Date.now() - startedAt > BATCH_TIME_BUDGET_MS) {
+      pending.push(acta.id);
+      return;
+    }
+    const base = { actaId: acta.id, procesoId: acta.proceso_id, fecha: acta.fecha };
+    let result: ActaBatchResult;
+
+    try {
+      const actaPayload = snapshotToPayload(acta, context, caller.authUserId, debug);
+      const { buffer, eventoContext, fileName } = await renderActa(actaPayload, cache);
+
+      if (zip) {
+        if (!progreso) await writer.ready;
+        const entryName = uniqueZipEntryName(fileName, usedZipNames);
+        zip.addFile(entryName, buffer);
+        result = { ...base, ok: true, fileName: entryName };
+      } else {
+        const uploaded = await uploadDocxToGoogleDrive({
+          filename: fileName,
+          buffer,
+          folderId: process.env.GOOGLE_DRIVE_FOLDER_ID ?? null,
+          shareWithEmails: eventoContext?.usuario?.email ? [eventoContext.usuario.email] : null,
+          usuarioId: eventoContext?.usuario?.id ?? null,
+          fallbackAuthUserId: caller.authUserId,
+        });
+        const nuevaActaId = await saveActaAudienciaSnapshot({ payload: actaPayload, uploaded });
+        result = {
+          ...base,
+          ok: true,
+          fileName: uploaded.name,
+          fileId: uploaded.id,
+          webViewLink: uploaded.webViewLink ?? null,
+          nuevaActaId,
+        };
+      }
+    } catch (e: unknown) {
+      console.warn("[regenerar-actas] Unable to regenerate acta:", acta.id, toErrorMessage(e));
+      result = { ...base, ok: false, error: toErrorMessage(e) };
+    }
+
+    results.push(result);
+    if (debug || results.length === total || results.length % 25 === 0) {
+      console.log("[regenerar-actas] progress", { completed: results.length, total, destino });
+    }
+    if (progreso) {
+      writeEvent({ type: "progress", completed: results.length, total, result });
+    }
+  };
+
+  void (async () => {
+    try {
+      if (progreso) writeEvent({ type: "start", total, concurrency });
+      await runWithConcurrency(actas, concurrency, processActa);
+
+      const succeeded = results.filter((r) => r.ok).length;
+      const summary = { total, succeeded, failed: results.length - succeeded, pending };
+      if (zip) {
+        zip.addFile("manifest.json", Buffer.from(JSON.stringify({ ...summary, results }, null, 2), "utf8"));
+        zip.finish();
+      }
+
+      if (zip && progreso) {
+        try {
+          const uploaded = await uploadFileToGoogleDrive({
+            filename: `actas-${stamp}.zip`,
+            buffer: Buffer.concat(zipChunks),
+            mimeType: "application/zip",
+            folderId: process.env.GOOGLE_DRIVE_FOLDER_ID ?? null,
+            fallbackAuthUserId: caller.authUserId,
+          });
+          writeEvent({
+            type: "done",
+            ...summary,
+            zip: {
+              fileId: uploaded.id,
+              fileName: uploaded.name,
+              webViewLink: uploaded.webViewLink ?? null,
+              webContentLink: uploaded.webContentLink ?? null,
+            },
+          });
+        } catch (e: unknown) {
+          console.error("[regenerar-actas] Unable to upload ZIP:", toErrorMessage(e));
+          writeEvent({ type: "error", ...summary, error: `Unable to upload ZIP: ${toErrorMessage(e)}` });
+        }
+      } else if (progreso) {
+        writeEvent({ type: "done", ...summary });
+      }
+      await writer.close();
+    } catch (e: unknown) {
+      console.error("[regenerar-actas] Batch aborted:", toErrorMessage(e));
+      await writer.abort(e).catch(() => undefined);
+    }
+  })();
+
+  return new Response(readable, {
+    headers: !progreso
+      ? {
+          "Content-Type": "application/zip",
+          "Content-Disposition": `attachment; filename="actas-${stamp}.zip"`,
+          "X-Actas-Total": String(total),
+        }
+      : {
+          "Content-Type": "application/x-ndjson; charset=utf-8",
+          "Cache-Control": "no-store",
+          "X-Actas-Total": String(total),
+        },
+  });
+}
@@ -0,0 +1,117 @@
+// Minimal streaming ZIP writer (store method, no compression). A .docx is already a
+// deflated ZIP container, so storing entries keeps output size the same while letting
+// each file be emitted as soon as it is ready, without buffering the whole archive.
+
+const ZIP_VERSION = 20;
+const ZIP_UTF8_FLAG = 0x0800;
+const ZIP_MAX_UINT32 = 0xffffffff;
+const ZIP_MAX_ENTRIES = 0xffff;
+
+const CRC32_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let n = 0; n < 256; n += 1) {
+    let c = n;
+    for (let k = 0; k < 8; k += 1) {
+      c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    }
+    table[n] = c >>> 0;
+  }
+  return table;
+})();
+
+function crc32(data: Uint8Array) {
+  let crc = 0xffffffff;
+  for (let i = 0; i < data.length; i += 1) {
+    crc = CRC32_TABLE[(crc ^ data[i]) & 0xff] ^ (crc >>> 8);
+  }
+  return (crc ^ 0xffffffff) >>> 0;
+}
+
+function toDosDateTime(value: Date) {
+  const year = Math.max(1980, value.getFullYear());
+  return {
+    time: (value.getHours() << 11) | (value.getMinutes() << 5) | Math.floor(value.getSeconds() / 2),
+    date: ((year - 1980) << 9) | ((value.getMonth() + 1) << 5) | value.getDate(),
+  };
+}
+
+type ZipCentralEntry = {
+  name: Buffer;
+  crc: number;
+  size: number;
+  offset: number;
+  time: number;
+  date: number;
+};
+
+export function createZipWriter(write: (chunk: Uint8Array) => void) {
+  const entries: ZipCentralEntry[] = [];
+  let offset = 0;
+
+  const emit = (chunk: Buffer) => {
+    write(chunk);
+    offset += chunk.length;
+  };
+
+  return {
+    addFile(fileName: string, data: Buffer, modifiedAt = new Date()) {
+      if (entries.length >= ZIP_MAX_ENTRIES) {
+        throw new Error("ZIP archive entry limit reached.");
+      }
+      if (offset + data.length > ZIP_MAX_UINT32) {
+        throw new Error("ZIP archive size limit reached.");
+      }
+
+      const name = Buffer.from(fileName, "utf8");
+      const { time, date } = toDosDateTime(modifiedAt);
+      const entry: ZipCentralEntry = { name, crc: crc32(data), size: data.length, offset, time, date };
+
+      const header = Buffer.alloc(30);
+      header.writeUInt32LE(0x04034b50, 0);
+      header.writeUInt16LE(ZIP_VERSION, 4);
+      header.writeUInt16LE(ZIP_UTF8_FLAG, 6);
+      header.writeUInt16LE(0, 8); // stored
+      header.writeUInt16LE(time, 10);
+      header.writeUInt16LE(date, 12);
+      header.writeUInt32LE(entry.crc, 14);
+      header.writeUInt32LE(entry.size, 18);
+      header.writeUInt32LE(entry.size, 22);
+      header.writeUInt16LE(name.length, 26);
+      header.writeUInt16LE(0, 28);
+
+      emit(header);
+      emit(name);
+      emit(data);
+      entries.push(entry);
+    },
+
+    finish() {
+      const centralStart = offset;
+      for (const entry of entries) {
+        const header = Buffer.alloc(46);
+        header.writeUInt32LE(0x02014b50, 0);
+        header.writeUInt16LE(ZIP_VERSION, 4);
+        header.writeUInt16LE(ZIP_VERSION, 6);
+        header.writeUInt16LE(ZIP_UTF8_FLAG, 8);
+        header.writeUInt16LE(0, 10); // stored
+        header.writeUInt16LE(entry.time, 12);
+        header.writeUInt16LE(entry.date, 14);
+        header.writeUInt32LE(entry.crc, 16);
+        header.writeUInt32LE(entry.size, 20);
+        header.writeUInt32LE(entry.size, 24);
+        header.writeUInt16LE(entry.name.length, 28);
+        header.writeUInt32LE(entry.offset, 42);
+        emit(header);
+        emit(entry.name);
+      }
+
+      const end = Buffer.alloc(22);
+      end.writeUInt32LE(0x06054b50, 0);
+      end.writeUInt16LE(entries.length, 8);
+      end.writeUInt16LE(entries.length, 10);
+      end.writeUInt32LE(offset - centralStart, 12);
+      end.writeUInt32LE(centralStart, 16);
+      emit(end);
+    },
+  };
+}